@@ -15,10 +15,13 @@ from __future__ import annotations
 import argparse
 import signal
 import sys
-import time
-from datetime import datetime
+import threading
+from datetime import datetime, timedelta
+from types import MappingProxyType
+from typing import Final
 
-from word_grid import get_words_for_time, get_minute_dots, get_lit_positions, GRID
+from word_grid import (get_words_for_time, get_display_state, GRID, GRID_COLS,
+                       CELLS_MASK, DOTS_SHIFT, WordSet)
 from display import DisplayRenderer, DisplayConfig
 
 # Try to import the RGB matrix library
@@ -29,18 +32,50 @@ except ImportError:
     HAS_MATRIX = False
     print("Warning: rgbmatrix library not found. Running in simulation mode.")
 
+# Named letter colors
+COLORS: Final = MappingProxyType({
+    "white": (255, 255, 255),
+    "warm": (255, 200, 150),
+    "cool": (200, 220, 255),
+    "red": (255, 0, 0),
+    "green": (0, 255, 0),
+    "blue": (0, 0, 255),
+    "orange": (255, 140, 0),
+    "yellow": (255, 255, 0),
+})
+
+# Value of each hex digit
+HEX_DIGITS: Final = MappingProxyType({c: i for i, c in enumerate("0123456789abcdef")})
+
+
+def parse_color(color_str: str) -> tuple[int, int, int]:
+    """Parse color from hex string (#RRGGBB) or name, defaulting to white."""
+    color_str = color_str.lower()
+    if color_str in COLORS:
+        return COLORS[color_str]
+
+    # Parse hex color
+    if color_str.startswith("#"):
+        color_str = color_str[1:]
+    if len(color_str) == 6 and all(c in HEX_DIGITS for c in color_str):
+        r1, r2, g1, g2, b1, b2 = (HEX_DIGITS[c] for c in color_str)
+        return (r1 * 16 + r2, g1 * 16 + g2, b1 * 16 + b2)
+
+    return (255, 255, 255)  # Default white
+
 
 class WordClock:
     """Main word clock controller."""
 
     def __init__(self, args):
         self.args = args
-        self.running = True
+        # Set to stop the main loop, also interrupting its sleep
+        self._stop = threading.Event()
 
         # Setup display configuration
         dim = args.dim_brightness
         self.display_config = DisplayConfig(
-            color_on=self._parse_color(args.color),
+            color_on=parse_color(args.color),
             color_dim=(dim, dim, dim),
             show_dim_letters=dim > 0,
         )
@@ -54,36 +89,12 @@ class WordClock:
             self.matrix = None
             self.canvas = None
 
-        # Track last displayed time to avoid unnecessary updates
-        self.last_minute = -1
-
-    def _parse_color(self, color_str: str) -> tuple[int, int, int]:
-        """Parse color from hex string or name."""
-        color_map = {
-            "white": (255, 255, 255),
-            "warm": (255, 200, 150),
-            "cool": (200, 220, 255),
-            "red": (255, 0, 0),
-            "green": (0, 255, 0),
-            "blue": (0, 0, 255),
-            "orange": (255, 140, 0),
-            "yellow": (255, 255, 0),
-        }
-
-        if color_str.lower() in color_map:
-            return color_map[color_str.lower()]
-
-        # Parse hex color
-        if color_str.startswith("#"):
-            color_str = color_str[1:]
-        if len(color_str) == 6:
-            return (
-                int(color_str[0:2], 16),
-                int(color_str[2:4], 16),
-                int(color_str[4:6], 16),
-            )
-
-        return (255, 255, 255)  # Default white
+        # (hour, minute) already rendered into the back buffer, if any
+        self._prepared_minute = None
+
+        # Precomputed ANSI-styled grid letters for simulation mode
+        self._bright_cells = [[f"\033[1;37m{c}\033[0m " for c in row] for row in GRID]  # Bold white
+        self._dim_cells = [[f"\033[2;30m{c}\033[0m " for c in row] for row in GRID]     # Dim
 
     def _create_matrix(self) -> "RGBMatrix":
         """Create and configure the RGB matrix."""
@@ -122,56 +133,72 @@ class WordClock:
         if now is None:
             now = datetime.now()
 
-        hour = now.hour
-        minute = now.minute
-
-        # Get words and positions
-        words = get_words_for_time(hour, minute)
-        positions = set(get_lit_positions(words))
-        dots = get_minute_dots(minute)
-
         if self.matrix and self.canvas:
-            # Render to canvas and swap
-            self.renderer.render_to_canvas(self.canvas, GRID, positions, dots)
-            self.canvas = self.matrix.SwapOnVSync(self.canvas)
+            # Render unless the back buffer already holds this minute, then swap
+            if self._prepared_minute != (now.hour, now.minute):
+                self._render(now)
+            self.canvas = self.renderer.swap(self.matrix, self.canvas)
+            self._prepared_minute = None
         else:
             # Simulation mode - print to console
-            self._print_simulation(hour, minute, words, positions, dots)
-
-    def _print_simulation(self, hour: int, minute: int, words: list[str],
-                         positions: set, dots: int):
-        """Print simulation output to console."""
-        # Clear screen
-        print("\033[2J\033[H", end="")
+            words = get_words_for_time(now.hour, now.minute)
+            state = get_display_state(now.hour, now.minute)
+            self._print_simulation(now.hour, now.minute, words,
+                                   state & CELLS_MASK, state >> DOTS_SHIFT)
+
+    def prepare_display(self, when: datetime):
+        """
+        Render the display for an upcoming time into the back buffer.
+
+        The next update_display() for the same minute then only swaps the
+        buffers, so rendering overlaps with the panel showing the current frame.
+        """
+        if self.matrix and self.canvas:
+            self._render(when)
+            self._prepared_minute = (when.hour, when.minute)
 
-        print("=" * 50)
-        print(f"  BÄRNER WORT-UHR  |  {hour:02d}:{minute:02d}")
-        print("=" * 50)
-        print()
+    def _render(self, now: datetime):
+        """Render the display for a time into the back buffer."""
+        state = get_display_state(now.hour, now.minute)
+        self.renderer.render_to_canvas(self.canvas, GRID, state & CELLS_MASK, state >> DOTS_SHIFT)
 
+    def _print_simulation(self, hour: int, minute: int, words: WordSet,
+                         lit_mask: int, dots: int):
+        """Print simulation output to console."""
         # Corner dots
         dot_chars = ["○", "○", "○", "○"]
         for i in range(dots):
             dot_chars[i] = "●"
 
-        print(f"    {dot_chars[0]}                       {dot_chars[1]}")
-        print()
+        lines = [
+            # Clear screen
+            "\033[2J\033[H" + "=" * 50,
+            f"  BÄRNER WORT-UHR  |  {hour:02d}:{minute:02d}",
+            "=" * 50,
+            "",
+            f"    {dot_chars[0]}                       {dot_chars[1]}",
+            "",
+        ]
 
         # Word grid
-        for row_idx, row in enumerate(GRID):
-            line = "      "
-            for col_idx, char in enumerate(row):
-                if (row_idx, col_idx) in positions:
-                    line += f"\033[1;37m{char}\033[0m "  # Bold white
-                else:
-                    line += f"\033[2;30m{char}\033[0m "  # Dim
-            print(line)
-
-        print()
-        print(f"    {dot_chars[3]}                       {dot_chars[2]}")
-        print()
-        print(f"  → {' '.join(words)}")
-        print()
+        for row_idx, (bright, dim) in enumerate(zip(self._bright_cells, self._dim_cells)):
+            row_mask = lit_mask >> (row_idx * GRID_COLS)
+            lines.append("      " + "".join(
+                bright[col_idx] if row_mask >> col_idx & 1 else dim[col_idx]
+                for col_idx in range(len(bright))
+            ))
+
+        lines += [
+            "",
+            f"    {dot_chars[3]}                       {dot_chars[2]}",
+            "",
+            f"  → {' '.join(words)}",
+            "",
+        ]
+
+        # Write the whole frame at once
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
 
     def run(self):
         """Main clock loop."""
@@ -182,26 +209,41 @@ class WordClock:
         signal.signal(signal.SIGINT, self._signal_handler)
         signal.signal(signal.SIGTERM, self._signal_handler)
 
-        while self.running:
+        if self.matrix:
+            # Build every frame up front, so no minute ever renders from scratch
+            states = (get_display_state(hour, minute)
+                      for hour in range(12) for minute in range(60))
+            self.renderer.warm_cache(
+                GRID, ((state & CELLS_MASK, state >> DOTS_SHIFT) for state in states))
+
+        while not self._stop.is_set():
+            # Read the clock once, so the minute shown, the minute prepared
+            # and the sleep all agree even across a boundary
             now = datetime.now()
+            self.update_display(now)
+
+            # Render the next minute ahead, so the boundary only swaps buffers
+            next_minute = now.replace(second=0, microsecond=0) + timedelta(minutes=1)
+            self.prepare_display(next_minute)
 
-            # Only update display when minute changes (or on first run)
-            if now.minute != self.last_minute:
-                self.update_display(now)
-                self.last_minute = now.minute
+            # The display only changes once a minute, so sleep until then
+            if self._stop.wait(self._seconds_until_next_minute(now)):
+                break
 
-            # Sleep until next second
-            time.sleep(1.0 - (time.time() % 1.0))
+    @staticmethod
+    def _seconds_until_next_minute(now: datetime) -> float:
+        """Seconds from now until just after the next minute boundary."""
+        # Small guard so we wake up after the boundary, not right before it
+        seconds = 60 - now.second - now.microsecond / 1e6 + 0.05
+        return max(0.1, seconds)
 
     def _signal_handler(self, signum, frame):
         """Handle shutdown signals."""
         print("\nShutting down...")
-        self.running = False
-        if self.matrix:
-            self.matrix.Clear()
+        self._stop.set()
 
     def cleanup(self):
-        """Clean up resources."""
+        """Clean up resources and blank the panel."""
         if self.matrix:
             self.matrix.Clear()
 
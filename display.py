@@ -4,17 +4,24 @@ Maps the 11x10 character grid to the physical LED panel.
 """
 from __future__ import annotations
 
+from collections import deque
+from collections.abc import Iterable, Sequence
 from dataclasses import dataclass
-import os
 
-from pixel_font import draw_char
+from pixel_font import draw_char_index
 
-# Try to import graphics module for font rendering
+# Pillow lets us push a whole frame to the canvas in a single call
 try:
-    from rgbmatrix import graphics
-    HAS_GRAPHICS = True
+    from PIL import Image
+    HAS_PIL = True
 except ImportError:
-    HAS_GRAPHICS = False
+    HAS_PIL = False
+
+# Palette indices used in framebuffers, expanded to RGB only when drawing
+PALETTE_OFF = 0   # Always black, like a cleared canvas
+PALETTE_DIM = 1
+PALETTE_ON = 2
+PALETTE_DOT = 3
 
 
 @dataclass
@@ -39,8 +46,9 @@ class DisplayConfig:
     # Corner dot size
     dot_size: int = 2
 
-    # Font path (None = use built-in)
-    font_path: str = None
+    # Number of rendered frames kept in memory; the default holds one
+    # frame for every display state (12 hours x 60 minutes, ~2.9 MB)
+    frame_cache_size: int = 720
 
 
 class DisplayRenderer:
@@ -48,54 +56,20 @@ class DisplayRenderer:
 
     def __init__(self, config: DisplayConfig = None):
         self.config = config or DisplayConfig()
-        self.font = None
-        self.font_width = 5
-        self.font_height = 6
-        self._load_font()
+        self._frame_cache = {}
+        # Last built background, as (key, framebuffer)
+        self._background = (None, None)
+        # (frame, palette) held by the front [0] and back [-1] buffers,
+        # None while unknown; see swap()
+        self._buffer_frames = deque([None, None], maxlen=2)
         self._calculate_layout()
 
-    def _load_font(self):
-        """Load the BDF font for rendering."""
-        if not HAS_GRAPHICS:
-            return
-
-        # Try to find a suitable small font
-        font_paths = [
-            self.config.font_path,
-            "/usr/share/fonts/misc/5x7.bdf",
-            "/usr/share/fonts/X11/misc/5x7.bdf",
-            # rpi-rgb-led-matrix fonts location
-            "/opt/rpi-rgb-led-matrix/fonts/5x7.bdf",
-            "/opt/rpi-rgb-led-matrix/fonts/4x6.bdf",
-            "fonts/5x7.bdf",
-            "fonts/4x6.bdf",
-        ]
-
-        for path in font_paths:
-            if path and os.path.exists(path):
-                self.font = graphics.Font()
-                self.font.LoadFont(path)
-                # Estimate font dimensions from path
-                if "4x6" in path:
-                    self.font_width = 4
-                    self.font_height = 6
-                elif "5x7" in path:
-                    self.font_width = 5
-                    self.font_height = 7
-                elif "5x8" in path:
-                    self.font_width = 5
-                    self.font_height = 8
-                elif "6x9" in path:
-                    self.font_width = 6
-                    self.font_height = 9
-                break
-
     def _calculate_layout(self):
         """Calculate grid layout to fit 11x10 characters on 64x64 display."""
         cfg = self.config
 
         # Calculate spacing to distribute characters evenly
-        # Total width needed: 11 chars * font_width + 10 gaps
+        # Total width needed: 11 chars * 5px glyphs + 10 gaps
         # We want this to fit in 64 pixels with some margin for dots
 
         # Leave 2 pixels on each side for corner dots
@@ -112,69 +86,206 @@ class DisplayRenderer:
         self.offset_x = (cfg.panel_width - total_width) // 2
         self.offset_y = (cfg.panel_height - total_height) // 2
 
-    def get_char_position(self, row: int, col: int) -> tuple:
-        """Get the pixel position for a character at grid position."""
-        x = self.offset_x + col * self.cell_width
-        # Font baseline is at bottom, so add cell_height
-        y = self.offset_y + row * self.cell_height + self.cell_height - 1
-        return (x, y)
+        # Top-left pixel of every character cell, indexed [row][col]
+        self._cell_origins = tuple(
+            tuple(
+                (self.offset_x + col * self.cell_width,
+                 self.offset_y + row * self.cell_height)
+                for col in range(cfg.grid_cols)
+            )
+            for row in range(cfg.grid_rows)
+        )
+
+        # Corner positions: top-left, top-right, bottom-right, bottom-left
+        size = cfg.dot_size
+        self._dot_corners = (
+            (0, 0),                                             # Top-left
+            (cfg.panel_width - size, 0),                        # Top-right
+            (cfg.panel_width - size, cfg.panel_height - size),  # Bottom-right
+            (0, cfg.panel_height - size),                       # Bottom-left
+        )
+
+        # Framebuffer offsets of every pixel of each corner dot
+        self._dot_offsets = tuple(
+            tuple(
+                (y + dy) * cfg.panel_width + x + dx
+                for dx in range(size)
+                for dy in range(size)
+            )
+            for x, y in self._dot_corners
+        )
 
     def get_dot_positions(self, num_dots: int) -> list:
         """Get pixel positions for minute indicator dots (corners)."""
+        return list(self._dot_corners[:max(num_dots, 0)])
+
+    def _get_background(self, grid: tuple[str, ...]) -> bytes:
+        """
+        Get the framebuffer of the static background.
+
+        This has every letter drawn dim (or nothing if dim letters are
+        off) and is only rebuilt when the grid or that setting changes.
+        """
         cfg = self.config
-        size = cfg.dot_size
-        positions = []
+        key = (grid, cfg.show_dim_letters)
+        if self._background[0] == key:
+            return self._background[1]
+
+        width = cfg.panel_width
+        fb = bytearray(width * cfg.panel_height)
+        if cfg.show_dim_letters:
+            origins = self._cell_origins
+            draw = draw_char_index
+            for row_idx, row in enumerate(grid):
+                origins_row = origins[row_idx]
+                for col_idx, char in enumerate(row):
+                    x, y = origins_row[col_idx]
+                    draw(fb, width, char, x, y, PALETTE_DIM)
+
+        self._background = (key, bytes(fb))
+        return self._background[1]
+
+    def _build_frame(self, grid: tuple[str, ...], lit_mask: int, num_dots: int) -> bytes:
+        """
+        Build the framebuffer of a complete clock frame.
 
-        # Corner positions: top-left, top-right, bottom-right, bottom-left
-        corners = [
-            (0, 0),                                          # Top-left
-            (cfg.panel_width - size, 0),                     # Top-right
-            (cfg.panel_width - size, cfg.panel_height - size),  # Bottom-right
-            (0, cfg.panel_height - size),                    # Bottom-left
-        ]
+        Returns the panel as palette indices, row by row (1 byte per pixel).
+        """
+        cfg = self.config
+        width = cfg.panel_width
+        fb = bytearray(self._get_background(grid))
+        origins = self._cell_origins
+        draw = draw_char_index
+
+        # Lit letters, drawn over their dim counterparts
+        bits = lit_mask
+        while bits:
+            lsb = bits & -bits
+            row_idx, col_idx = divmod(lsb.bit_length() - 1, cfg.grid_cols)
+            x, y = origins[row_idx][col_idx]
+            draw(fb, width, grid[row_idx][col_idx], x, y, PALETTE_ON)
+            bits ^= lsb
+
+        # Minute dots
+        for offsets in self._dot_offsets[:max(num_dots, 0)]:
+            for i in offsets:
+                fb[i] = PALETTE_DOT
+
+        return bytes(fb)
+
+    def get_frame(self, grid: Sequence[str], lit_mask: int, num_dots: int) -> bytes:
+        """
+        Get the (cached) framebuffer for a display state.
 
-        for i in range(min(num_dots, 4)):
-            positions.append(corners[i])
+        Frames hold palette indices, so they stay valid when colors change.
+        """
+        cfg = self.config
+        grid = tuple(grid)
+        key = (grid, lit_mask, num_dots, cfg.show_dim_letters)
+
+        frame = self._frame_cache.get(key)
+        if frame is None:
+            frame = self._build_frame(grid, lit_mask, num_dots)
+            # Drop the oldest entry once the cache is full
+            if len(self._frame_cache) >= cfg.frame_cache_size:
+                del self._frame_cache[next(iter(self._frame_cache))]
+            self._frame_cache[key] = frame
+        return frame
+
+    def warm_cache(self, grid: Sequence[str], states: Iterable[tuple[int, int]]):
+        """
+        Build the frames of many display states ahead of time.
 
-        return positions
+        Args:
+            grid: The character grid, one string per row (e.g. GRID)
+            states: Iterable of (lit_mask, num_dots) pairs
+        """
+        for lit_mask, num_dots in states:
+            self.get_frame(grid, lit_mask, num_dots)
 
-    def render_to_canvas(self, canvas, grid: list, lit_positions: set, num_dots: int):
+    def render_to_canvas(self, canvas, grid: Sequence[str], lit_mask: int, num_dots: int):
         """
         Render the clock display to a canvas.
 
+        The canvas is updated incrementally: only pixels that differ from the
+        frame the back buffer already holds are redrawn. Nothing else may
+        draw on the canvases, and buffers must be swapped with swap().
+
         Args:
             canvas: rgbmatrix canvas instance
-            grid: The character grid (list of strings)
-            lit_positions: Set of (row, col) positions to illuminate brightly
+            grid: The character grid, one string per row (e.g. GRID)
+            lit_mask: Bitmask of cells to illuminate brightly
+                (bit row * grid_cols + col)
             num_dots: Number of minute dots (0-4)
         """
         cfg = self.config
+        frame = self.get_frame(grid, lit_mask, num_dots)
+        palette = self.get_palette()
+
+        shown = self._buffer_frames[-1]
+        if shown == (frame, palette):
+            return canvas
+
+        if HAS_PIL:
+            # Blit the whole frame at once
+            size = (cfg.panel_width, cfg.panel_height)
+            rgb = self._expand_frame(frame, palette)
+            canvas.SetImage(Image.frombuffer("RGB", size, rgb, "raw", "RGB", 0, 1))
+        elif shown is None or shown[1] != palette:
+            # Unknown contents or colors: clear, then draw only what is not black
+            canvas.Clear()
+            self._update_canvas(canvas, bytes(len(frame)), frame, palette)
+        else:
+            self._update_canvas(canvas, shown[0], frame, palette)
+
+        self._buffer_frames[-1] = (frame, palette)
+        return canvas
 
-        # Clear canvas
-        canvas.Clear()
+    def swap(self, matrix, canvas):
+        """
+        Show a rendered canvas on the next vsync (SwapOnVSync).
 
-        # Use built-in pixel font for guaranteed umlaut support
-        for row_idx, row in enumerate(grid):
-            for col_idx, char in enumerate(row):
-                x = self.offset_x + col_idx * self.cell_width
-                y = self.offset_y + row_idx * self.cell_height
+        Keeps track of which frame each buffer holds, so always swap through
+        here instead of calling matrix.SwapOnVSync() directly.
 
-                if (row_idx, col_idx) in lit_positions:
-                    draw_char(canvas, char, x, y, cfg.color_on)
-                elif cfg.show_dim_letters:
-                    draw_char(canvas, char, x, y, cfg.color_dim)
+        Returns:
+            The new back buffer to render the next frame into
+        """
+        canvas = matrix.SwapOnVSync(canvas)
+        self._buffer_frames.rotate(1)
+        return canvas
 
-        # Draw minute dots
-        dot_positions = self.get_dot_positions(num_dots)
-        for x, y in dot_positions:
-            for dx in range(cfg.dot_size):
-                for dy in range(cfg.dot_size):
-                    canvas.SetPixel(x + dx, y + dy, *cfg.color_dot)
+    def get_palette(self) -> tuple:
+        """Get the RGB color of each palette index."""
+        cfg = self.config
+        return ((0, 0, 0), tuple(cfg.color_dim), tuple(cfg.color_on), tuple(cfg.color_dot))
+
+    def _expand_frame(self, frame: bytes, palette: tuple) -> bytes:
+        """Expand a palette-index frame to packed RGB bytes."""
+        rgb = bytearray(len(frame) * 3)
+        for channel in range(3):
+            table = bytes(color[channel] for color in palette).ljust(256, b"\0")
+            rgb[channel::3] = frame.translate(table)
+        return bytes(rgb)
+
+    def _update_canvas(self, canvas, old_frame: bytes, frame: bytes, palette: tuple):
+        """Redraw only the pixels that changed between two frames."""
+        cfg = self.config
+        set_pixel = canvas.SetPixel
+        width = cfg.panel_width
 
-        return canvas
+        for y in range(cfg.panel_height):
+            start = y * width
+            row = frame[start:start + width]
+            if row == old_frame[start:start + width]:
+                continue
+
+            for x, (index, old_index) in enumerate(zip(row, old_frame[start:start + width])):
+                if index != old_index:
+                    set_pixel(x, y, *palette[index])
 
 
-def preview_display(grid: list, lit_positions: set, num_dots: int):
+def preview_display(grid: Sequence[str], lit_mask: int, num_dots: int):
     """Print an ASCII preview of the display for debugging."""
     print("\nDisplay Preview:")
 
@@ -189,7 +300,7 @@ def preview_display(grid: list, lit_positions: set, num_dots: int):
     for row_idx, row in enumerate(grid):
         line = "  "
         for col_idx, char in enumerate(row):
-            if (row_idx, col_idx) in lit_positions:
+            if lit_mask >> (row_idx * len(row) + col_idx) & 1:
                 line += char + " "
             else:
                 line += "· "
@@ -200,17 +311,17 @@ def preview_display(grid: list, lit_positions: set, num_dots: int):
 
 
 if __name__ == "__main__":
-    from word_grid import get_words_for_time, get_minute_dots, get_lit_positions, GRID
+    from word_grid import get_words_for_time, get_minute_dots, get_lit_mask, GRID
 
     # Test rendering
     hour, minute = 14, 47
 
     words = get_words_for_time(hour, minute)
-    positions = set(get_lit_positions(words))
+    lit_mask = get_lit_mask(words)
     dots = get_minute_dots(minute)
 
     print(f"Time: {hour}:{minute:02d}")
     print(f"Words: {' '.join(words)}")
     print(f"Dots: {dots}")
 
-    preview_display(GRID, positions, dots)
+    preview_display(GRID, lit_mask, dots)
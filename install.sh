@@ -30,6 +30,7 @@ sudo apt-get install -y \
     git \
     python3-dev \
     python3-pip \
+    python3-pil \
     libgraphicsmagick++-dev \
     libwebp-dev
 
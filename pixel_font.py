@@ -5,6 +5,8 @@ Each character is a 5x5 bitmap stored as a list of 5 integers (rows).
 """
 from __future__ import annotations
 
+from functools import lru_cache
+
 # 5x5 pixel font - each row is a 5-bit integer, MSB is leftmost pixel
 FONT_5X5 = {
     'A': [0b01110, 0b10001, 0b11111, 0b10001, 0b10001],
@@ -41,12 +43,44 @@ FONT_5X5 = {
     ' ': [0b00000, 0b00000, 0b00000, 0b00000, 0b00000],
 }
 
+# Each glyph packed into one 25-bit integer: row 0 in bits 24-20, row 4 in bits 4-0
+FONT_PACKED = {
+    char: (r0 << 20) | (r1 << 15) | (r2 << 10) | (r3 << 5) | r4
+    for char, (r0, r1, r2, r3, r4) in FONT_5X5.items()
+}
+
+
+def _unpack_pixels(bits: int) -> tuple:
+    """Get the (dx, dy) offsets of the set bits of a packed glyph."""
+    pixels = []
+    while bits:
+        lsb = bits & -bits
+        row_idx, col_idx = divmod(24 - (lsb.bit_length() - 1), 5)
+        pixels.append((col_idx, row_idx))
+        bits ^= lsb
+    return tuple(reversed(pixels))
+
+
+# Lit pixel offsets (dx, dy) per character, in reading order
+FONT_PIXELS = {char: _unpack_pixels(bits) for char, bits in FONT_PACKED.items()}
+
 
 def get_char_bitmap(char: str) -> list:
     """Get the 5x5 bitmap for a character."""
     return FONT_5X5.get(char.upper(), FONT_5X5.get(' '))
 
 
+def get_char_pixels(char: str) -> tuple:
+    """Get the (dx, dy) offsets of the lit pixels of a character."""
+    return FONT_PIXELS.get(char.upper(), FONT_PIXELS[' '])
+
+
+@lru_cache(maxsize=None)
+def get_char_offsets(char: str, width: int) -> tuple:
+    """Get the pixel offsets of a character's lit pixels in a framebuffer."""
+    return tuple(dy * width + dx for dx, dy in get_char_pixels(char))
+
+
 def draw_char(canvas, char: str, x: int, y: int, color: tuple):
     """
     Draw a character on a canvas using the built-in font.
@@ -58,14 +92,25 @@ def draw_char(canvas, char: str, x: int, y: int, color: tuple):
         y: Y position (top-left)
         color: RGB color tuple
     """
-    bitmap = get_char_bitmap(char)
-    if bitmap is None:
-        return
+    for dx, dy in get_char_pixels(char):
+        canvas.SetPixel(x + dx, y + dy, *color)
 
-    for row_idx, row_bits in enumerate(bitmap):
-        for col_idx in range(5):
-            if row_bits & (0b10000 >> col_idx):
-                canvas.SetPixel(x + col_idx, y + row_idx, *color)
+
+def draw_char_index(fb: bytearray, width: int, char: str, x: int, y: int, index: int):
+    """
+    Draw a character into a palette-index framebuffer.
+
+    Args:
+        fb: Framebuffer with one palette index byte per pixel, row by row
+        width: Width of the framebuffer in pixels
+        char: The character to draw
+        x: X position (top-left)
+        y: Y position (top-left)
+        index: Palette index to set the lit pixels to
+    """
+    base = y * width + x
+    for offset in get_char_offsets(char, width):
+        fb[base + offset] = index
 
 
 def preview_char(char: str):
@@ -4,8 +4,18 @@ Test suite for the Bernese German word clock.
 Run without any hardware to verify the time-to-words logic.
 """
 
+import argparse
 import unittest
-from word_grid import get_words_for_time, get_minute_dots, HOUR_WORDS, WORDS
+from datetime import datetime, timedelta
+from unittest import mock
+
+import clock
+import display
+from display import DisplayConfig, DisplayRenderer
+from word_grid import (get_words_for_time, get_minute_dots, get_lit_positions, get_lit_mask,
+                       get_display_state, get_row_mask, word_ids_to_names,
+                       print_time_display, HOUR_WORDS, WORDS, GRID, GRID_FLAT, GRID_COLS,
+                       CELLS_MASK, DOTS_SHIFT)
 
 
 class TestWordClock(unittest.TestCase):
@@ -160,6 +170,41 @@ class TestWordClock(unittest.TestCase):
             word = HOUR_WORDS[hour]
             self.assertIn(word, WORDS)
 
+    def test_words_read_as_phrase(self):
+        """Test that the words iterate in reading order."""
+        self.assertEqual(" ".join(get_words_for_time(7, 25)), "ES ISCH FÜF VOR HAUBI ACHTI")
+        self.assertEqual(" ".join(get_words_for_time(7, 35)), "ES ISCH FÜF AB HAUBI ACHTI")
+        self.assertEqual(" ".join(get_words_for_time(0, 0)), "ES ISCH ZWÖUFI UHR")
+
+    def test_word_set(self):
+        """Test that a WordSet behaves like a collection of word keys."""
+        words = get_words_for_time(7, 45)
+        self.assertEqual(len(words), 5)
+        self.assertEqual(word_ids_to_names(words), ("ES", "ISCH", "VIERT", "VOR", "ACHTI"))
+        self.assertEqual(get_lit_mask(words), get_lit_mask(list(words)))
+        self.assertNotIn("NOT A WORD", words)
+
+    def test_display_state(self):
+        """Test that the display state packs the lit cells and minute dots."""
+        for hour in range(24):
+            for minute in range(60):
+                state = get_display_state(hour, minute)
+                self.assertEqual(state & CELLS_MASK, get_lit_mask(get_words_for_time(hour, minute)))
+                self.assertEqual(state >> DOTS_SHIFT, get_minute_dots(minute))
+
+    def test_row_masks(self):
+        """Test that the row masks split the lit cells by grid row."""
+        for hour, minute in [(0, 0), (7, 25), (10, 47), (23, 59)]:
+            state = get_display_state(hour, minute)
+            rows = [get_row_mask(hour, minute, row) for row in range(len(GRID))]
+            self.assertEqual(sum(mask << (row * GRID_COLS) for row, mask in enumerate(rows)),
+                             state & CELLS_MASK)
+
+        # Rows outside the grid must not read a neighbouring time's rows
+        for row in (-1, len(GRID)):
+            with self.assertRaises(IndexError):
+                get_row_mask(0, 0, row)
+
     def test_es_isch_always_present(self):
         """Test that ES ISCH is always in the output."""
         for hour in range(24):
@@ -174,14 +219,12 @@ class TestWordGrid(unittest.TestCase):
 
     def test_grid_dimensions(self):
         """Test that the grid has correct dimensions."""
-        from word_grid import GRID
         self.assertEqual(len(GRID), 10)  # 10 rows
         for row in GRID:
             self.assertEqual(len(row), 11)  # 11 columns
 
     def test_word_positions_valid(self):
         """Test that all word positions are within grid bounds."""
-        from word_grid import WORDS, GRID
         for word, (row, start, end) in WORDS.items():
             self.assertLess(row, len(GRID), f"Row out of bounds for {word}")
             self.assertLessEqual(end, len(GRID[row]) - 1, f"Column out of bounds for {word}")
@@ -189,17 +232,288 @@ class TestWordGrid(unittest.TestCase):
 
     def test_word_extraction(self):
         """Test that words can be extracted from their positions."""
-        from word_grid import WORDS, GRID
-
         for word, (row, start, end) in WORDS.items():
             extracted = GRID[row][start:end + 1]
             self.assertEqual(extracted, word, f"Word {word} doesn't match grid at ({row}, {start}-{end})")
 
+    def test_flat_grid(self):
+        """Test that the flat grid matches the grid rows cell by cell."""
+        for row, line in enumerate(GRID):
+            for col, char in enumerate(line):
+                self.assertEqual(GRID_FLAT[row * GRID_COLS + col], char)
+
+    def test_lit_mask_matches_positions(self):
+        """Test that the lit bitmask has exactly the lit positions set."""
+        for hour in range(12):
+            for minute in range(0, 60, 5):
+                words = get_words_for_time(hour, minute)
+                mask = get_lit_mask(words)
+                expected = {row * GRID_COLS + col for row, col in get_lit_positions(words)}
+                actual = {bit for bit in range(mask.bit_length()) if mask >> bit & 1}
+                self.assertEqual(actual, expected, f"Mask mismatch at {hour}:{minute:02d}")
+
+
+class FakeCanvas:
+    """Canvas stand-in that records what is drawn on it."""
+
+    def __init__(self):
+        self.pixels = {}
+        self.clears = 0
+
+    def SetPixel(self, x, y, r, g, b):
+        self.pixels[x, y] = (r, g, b)
+
+    def Clear(self):
+        self.pixels.clear()
+        self.clears += 1
+
+    def image(self) -> dict:
+        """Get the colors of all pixels that are not black."""
+        return {pos: color for pos, color in self.pixels.items() if color != (0, 0, 0)}
+
+
+class FakeMatrix:
+    """RGBMatrix stand-in whose SwapOnVSync flips between two canvases."""
+
+    def __init__(self):
+        self.front, self.back = FakeCanvas(), FakeCanvas()
+        self.swaps = 0
+
+    def CreateFrameCanvas(self):
+        return self.back
+
+    def SwapOnVSync(self, canvas):
+        # Show the canvas and hand back the one shown before
+        self.front, self.back = canvas, self.front
+        self.swaps += 1
+        return self.back
+
+    def Clear(self):
+        self.front.Clear()
+
+
+def full_redraw(config: DisplayConfig, state: int) -> dict:
+    """Draw a display state from scratch on a blank canvas, pixel by pixel."""
+    canvas = FakeCanvas()
+    with mock.patch("display.HAS_PIL", False):
+        DisplayRenderer(config).render_to_canvas(
+            canvas, GRID, state & CELLS_MASK, state >> DOTS_SHIFT)
+    return canvas.image()
+
+
+class TestDisplayRenderer(unittest.TestCase):
+    """Test rendering to the LED matrix canvas."""
+
+    def setUp(self):
+        # Exercise the per-pixel path, with or without Pillow installed
+        patcher = mock.patch("display.HAS_PIL", False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_incremental_matches_full_redraw(self):
+        """Test that double-buffered updates show the same as full redraws."""
+        config = DisplayConfig()
+        renderer = DisplayRenderer(config)
+        matrix = FakeMatrix()
+        canvas = matrix.CreateFrameCanvas()
+
+        # Across an hour boundary, so whole words change as well as dots
+        for minute in range(50, 75):
+            state = get_display_state(10 + minute // 60, minute % 60)
+            renderer.render_to_canvas(canvas, GRID, state & CELLS_MASK, state >> DOTS_SHIFT)
+            canvas = renderer.swap(matrix, canvas)
+            self.assertEqual(matrix.front.image(), full_redraw(config, state),
+                             f"Frame mismatch at minute {minute}")
+
+        # Each buffer is only cleared the first time it is drawn
+        self.assertEqual((matrix.front.clears, matrix.back.clears), (1, 1))
+
+    def test_palette_change_redraws(self):
+        """Test that changing a color redraws the whole canvas."""
+        config = DisplayConfig()
+        renderer = DisplayRenderer(config)
+        matrix = FakeMatrix()
+        canvas = matrix.CreateFrameCanvas()
+        state = get_display_state(10, 7)
+
+        for _ in range(2):
+            renderer.render_to_canvas(canvas, GRID, state & CELLS_MASK, state >> DOTS_SHIFT)
+            canvas = renderer.swap(matrix, canvas)
+
+        config.color_on = (255, 0, 0)
+        renderer.render_to_canvas(canvas, GRID, state & CELLS_MASK, state >> DOTS_SHIFT)
+        self.assertEqual(canvas.clears, 2)
+        self.assertEqual(canvas.image(), full_redraw(config, state))
+
+    def test_expand_frame(self):
+        """Test that every palette index expands to its palette color."""
+        config = DisplayConfig(color_on=(10, 20, 30), color_dim=(1, 2, 3),
+                               color_dot=(200, 100, 50))
+        renderer = DisplayRenderer(config)
+        palette = renderer.get_palette()
+        rgb = renderer._expand_frame(bytes(range(len(palette))), palette)
+        for index, color in enumerate(palette):
+            self.assertEqual(tuple(rgb[index * 3:index * 3 + 3]), color)
+
+
+class FakeImageCanvas:
+    """Canvas stand-in that records the images set on it."""
+
+    def __init__(self):
+        self.images = []
+
+    def SetImage(self, image):
+        self.images.append(image.copy())
+
+    def image(self) -> dict:
+        """Get the colors of all pixels of the last image that are not black."""
+        image = self.images[-1]
+        width, height = image.size
+        pixels = ((x, y) for y in range(height) for x in range(width))
+        return {pos: image.getpixel(pos) for pos in pixels if image.getpixel(pos) != (0, 0, 0)}
+
+
+@unittest.skipUnless(display.HAS_PIL, "Pillow is not installed")
+class TestDisplayRendererImage(unittest.TestCase):
+    """Test rendering whole frames to the canvas with Pillow."""
+
+    def test_image_matches_full_redraw(self):
+        """Test that the blitted image shows the same as a pixel-by-pixel redraw."""
+        config = DisplayConfig(color_on=(10, 20, 30), color_dot=(200, 100, 50))
+        renderer = DisplayRenderer(config)
+        canvas = FakeImageCanvas()
+
+        for hour, minute in ((10, 0), (10, 7), (11, 59), (0, 33)):
+            state = get_display_state(hour, minute)
+            renderer.render_to_canvas(canvas, GRID, state & CELLS_MASK, state >> DOTS_SHIFT)
+            image = canvas.images[-1]
+            self.assertEqual(image.mode, "RGB")
+            self.assertEqual(image.size, (config.panel_width, config.panel_height))
+            self.assertEqual(canvas.image(), full_redraw(config, state),
+                             f"Image mismatch at {hour}:{minute:02d}")
+
+    def test_unchanged_buffer_not_redrawn(self):
+        """Test that a buffer already holding the frame is left alone."""
+        renderer = DisplayRenderer()
+        matrix = FakeMatrix()
+        matrix.front, matrix.back = FakeImageCanvas(), FakeImageCanvas()
+        canvas = matrix.CreateFrameCanvas()
+        first = get_display_state(10, 7)
+        second = get_display_state(10, 8)
+
+        for state in (first, first, second):
+            renderer.render_to_canvas(canvas, GRID, state & CELLS_MASK, state >> DOTS_SHIFT)
+            canvas = renderer.swap(matrix, canvas)
+        # Every render went to a buffer holding another frame (or none)
+        self.assertEqual((len(matrix.front.images), len(matrix.back.images)), (2, 1))
+
+        # The back buffer still holds the first frame, so nothing is set
+        renderer.render_to_canvas(canvas, GRID, first & CELLS_MASK, first >> DOTS_SHIFT)
+        self.assertEqual(len(canvas.images), 1)
+
+
+class TestClockDisplay(unittest.TestCase):
+    """Test how the clock renders ahead and swaps the LED matrix buffers."""
+
+    def setUp(self):
+        self.matrix = FakeMatrix()
+        for patcher in (mock.patch("display.HAS_PIL", False),
+                        mock.patch("clock.HAS_MATRIX", True),
+                        mock.patch.object(clock.WordClock, "_create_matrix",
+                                          return_value=self.matrix)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        args = argparse.Namespace(color="white", dim_brightness=40, simulate=False)
+        self.clock = clock.WordClock(args)
+        patcher = mock.patch.object(self.clock.renderer, "render_to_canvas",
+                                    wraps=self.clock.renderer.render_to_canvas)
+        self.render = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def assertShows(self, when: datetime):
+        """Assert that the panel shows the full redraw of a time."""
+        state = get_display_state(when.hour, when.minute)
+        self.assertEqual(self.matrix.front.image(),
+                         full_redraw(self.clock.display_config, state),
+                         f"Panel mismatch at {when:%H:%M}")
+
+    def test_prepared_minute_only_swaps(self):
+        """Test that showing a prepared minute swaps without rendering."""
+        now = datetime(2026, 1, 1, 10, 7, 30)
+        next_minute = datetime(2026, 1, 1, 10, 8)
+        self.clock.update_display(now)
+        self.clock.prepare_display(next_minute)
+        self.render.reset_mock()
+
+        self.clock.update_display(next_minute)
+        self.render.assert_not_called()
+        self.assertEqual(self.matrix.swaps, 2)
+        self.assertShows(next_minute)
+
+    def test_mismatched_minute_rerenders(self):
+        """Test that a minute other than the prepared one is rendered again."""
+        now = datetime(2026, 1, 1, 10, 7, 30)
+        self.clock.update_display(now)
+        self.clock.prepare_display(datetime(2026, 1, 1, 10, 8))
+        self.render.reset_mock()
+
+        # Woke up late, a minute past the prepared one
+        late = datetime(2026, 1, 1, 10, 9, 0, 200000)
+        self.clock.update_display(late)
+        self.render.assert_called_once()
+        self.assertIs(self.render.call_args.args[0], self.matrix.front)
+        self.assertEqual(self.matrix.swaps, 2)
+        self.assertShows(late)
+
+    def test_shown_matches_full_redraw(self):
+        """Test that the panel matches a full redraw minute by minute."""
+        # Across an hour boundary, the way run() steps through the minutes
+        now = datetime(2026, 1, 1, 10, 50, 0, 50000)
+        for _ in range(20):
+            self.clock.update_display(now)
+            self.assertShows(now)
+            next_minute = now.replace(second=0, microsecond=0) + timedelta(minutes=1)
+            self.clock.prepare_display(next_minute)
+            now = next_minute + timedelta(seconds=0.05)
+
+    def test_seconds_until_next_minute(self):
+        """Test the sleep at either side of a minute boundary."""
+        seconds = clock.WordClock._seconds_until_next_minute
+        self.assertAlmostEqual(seconds(datetime(2026, 1, 1, 10, 7, 59, 999000)), 0.1)
+        self.assertAlmostEqual(seconds(datetime(2026, 1, 1, 10, 8, 0, 0)), 60.05)
+
+
+class TestParseColor(unittest.TestCase):
+    """Test parsing of letter colors."""
+
+    def test_named_color(self):
+        """Test that color names are matched in any case."""
+        self.assertEqual(clock.parse_color("warm"), (255, 200, 150))
+        self.assertEqual(clock.parse_color("Orange"), (255, 140, 0))
+        self.assertEqual(clock.parse_color("BLUE"), (0, 0, 255))
+
+    def test_hex_color(self):
+        """Test that hex colors are parsed with or without #, in any case."""
+        self.assertEqual(clock.parse_color("#FF8000"), (255, 128, 0))
+        self.assertEqual(clock.parse_color("#a0B1c2"), (160, 177, 194))
+        self.assertEqual(clock.parse_color("102030"), (16, 32, 48))
+
+    def test_invalid_color_defaults_to_white(self):
+        """Test that unparseable colors fall back to white."""
+        for color_str in ("#fff", "#12345", "1234567", "", "#zzzzzz", "12345g", "purple"):
+            self.assertEqual(clock.parse_color(color_str), (255, 255, 255), color_str)
+
+    def test_colors_read_only(self):
+        """Test that the color tables cannot be changed."""
+        with self.assertRaises(TypeError):
+            clock.COLORS["white"] = (0, 0, 0)
+        with self.assertRaises(TypeError):
+            clock.HEX_DIGITS["g"] = 16
+
 
 def run_visual_demo():
     """Run a visual demonstration of all times."""
-    from word_grid import print_time_display
-
     print("\n" + "=" * 50)
     print("  VISUAL DEMO - All 12 time intervals")
     print("=" * 50)